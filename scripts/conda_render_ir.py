@@ -9,6 +9,11 @@ import pathlib
 import sys
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 
 def normalize_list(value: Any) -> list[str]:
     if value is None:
@@ -19,41 +24,34 @@ def normalize_list(value: Any) -> list[str]:
     return [text] if text else []
 
 
-def first_url(source: Any) -> str:
-    if isinstance(source, dict):
-        url = source.get("url")
-        if isinstance(url, list):
-            return next((str(item).strip() for item in url if str(item).strip()), "")
-        return str(url).strip() if url is not None else ""
-    if isinstance(source, list):
-        for item in source:
-            url = first_url(item)
-            if url:
-                return url
-    if isinstance(source, str):
-        return source.strip()
-    return ""
-
-
-def primary_source(source: Any) -> Any:
-    if isinstance(source, list):
-        return source[0] if source else {}
-    return source
-
-
-def source_folder(source: Any) -> str:
-    source = primary_source(source)
-    if isinstance(source, dict):
-        folder = source.get("folder")
-        return str(folder).strip() if folder is not None else ""
-    return ""
-
-
-def source_patches(source: Any) -> list[str]:
-    source = primary_source(source)
-    if isinstance(source, dict):
-        return normalize_list(source.get("patches"))
-    return []
+def dict_url(source: dict[str, Any]) -> str:
+    url = source.get("url")
+    if isinstance(url, list):
+        return next((str(item).strip() for item in url if str(item).strip()), "")
+    return str(url).strip() if url is not None else ""
+
+
+def extract_source(source: Any) -> tuple[str, str, list[str]]:
+    """Return (first URL, primary folder, primary patches) from one walk of ``source``."""
+    primary = source[0] if isinstance(source, list) and source else source
+    folder = ""
+    patches: list[str] = []
+    if isinstance(primary, dict):
+        folder_value = primary.get("folder")
+        folder = str(folder_value).strip() if folder_value is not None else ""
+        patches = normalize_list(primary.get("patches"))
+
+    url = ""
+    stack = [source]
+    while stack and not url:
+        node = stack.pop()
+        if isinstance(node, dict):
+            url = dict_url(node)
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, str):
+            url = node.strip()
+    return url, folder, patches
 
 
 def build_script(value: Any) -> str | None:
@@ -86,9 +84,19 @@ def default_payload(recipe_dir: pathlib.Path, skip: bool) -> dict[str, Any]:
     }
 
 
+def encode_payload(payload: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        except TypeError:  # e.g. lone surrogates, which stdlib json escapes
+            pass
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
 def emit(payload: dict[str, Any]) -> int:
-    json.dump(payload, sys.stdout, sort_keys=True)
-    sys.stdout.write("\n")
+    sys.stdout.flush()
+    sys.stdout.buffer.write(encode_payload(payload) + b"\n")
+    sys.stdout.buffer.flush()
     return 0
 
 
@@ -127,9 +135,10 @@ def main() -> int:
     payload["build_number"] = str(build_number).strip() or "0"
 
     source = meta.get_value("source", default={})
-    payload["source_url"] = first_url(source)
-    payload["source_folder"] = source_folder(source)
-    payload["source_patches"] = source_patches(source)
+    source_url, folder, patches = extract_source(source)
+    payload["source_url"] = source_url
+    payload["source_folder"] = folder
+    payload["source_patches"] = patches
 
     about = meta.get_value("about", default={}) or {}
     payload["homepage"] = str(about.get("home") or "").strip()
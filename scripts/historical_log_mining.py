@@ -5,13 +5,25 @@ from __future__ import annotations
 
 import argparse
 import csv
+import io
 import json
+import mmap
+import os
 import re
-from collections import Counter, defaultdict
-from dataclasses import dataclass
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, NamedTuple, Sequence
+
+try:
+    import re2
+except ImportError:  # pragma: no cover - optional faster regex engine
+    re2 = None
+
+RULE_FLAGS = re.IGNORECASE
 
 
 @dataclass(frozen=True)
@@ -19,11 +31,30 @@ class Rule:
     canonical: str
     stage: str
     stage_failure: str
-    pattern: re.Pattern[str]
+    raw: str
     structural_label: str
     normalization_layer: str
     automation_feasibility: str
     deterministic_opportunity: bool
+    # Compiled from ``raw`` with the same flags as the combined pattern.
+    pattern: re.Pattern[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "pattern", re.compile(self.raw, RULE_FLAGS))
+
+
+class Record(NamedTuple):
+    package: str
+    stage: str
+    stage_failure: str
+    canonical_class: str
+    source_type: str
+    timestamp: str
+    execution_mode: str
+    raw_signal: str
+    log_excerpt: str
+    artifact_path: str
+    has_patch_activity: bool = False
 
 
 RULES: list[Rule] = [
@@ -31,10 +62,7 @@ RULES: list[Rule] = [
         "MetadataAdapterRuntimeMissing",
         "Ingestion",
         "AdapterConstraintFailure",
-        re.compile(
-            r"(conda[_-]?build.*(not installed|import failed)|No module named 'conda_build')",
-            re.IGNORECASE,
-        ),
+        r"conda[_-]?build.*(?:not installed|import failed)|No module named 'conda_build'",
         "Adapter Infrastructure Issue",
         "ModulePolicy",
         "High",
@@ -44,7 +72,7 @@ RULES: list[Rule] = [
         "MetadataRenderFailure",
         "Ingestion",
         "RecipeParseFailure",
-        re.compile(r"failed to parse rendered metadata", re.IGNORECASE),
+        r"failed to parse rendered metadata",
         "Adapter Infrastructure Issue",
         "ModulePolicy",
         "High",
@@ -54,7 +82,7 @@ RULES: list[Rule] = [
         "DependencyBlockedCascade",
         "DependencyNormalization",
         "DependencyResolutionFailure",
-        re.compile(r"blocked by failed dependencies", re.IGNORECASE),
+        r"blocked by failed dependencies",
         "Dependency Translation Defect",
         "DependencyClassifier",
         "High",
@@ -64,10 +92,7 @@ RULES: list[Rule] = [
         "UnresolvedBuildRequiresToken",
         "DependencyNormalization",
         "DependencyResolutionFailure",
-        re.compile(
-            r"(DEPGRAPH\|[^|]+\|unresolved\||Failed build dependencies:|No match for argument:)",
-            re.IGNORECASE,
-        ),
+        r"DEPGRAPH\|[^|]+\|unresolved\||Failed build dependencies:|No match for argument:",
         "Dependency Translation Defect",
         "DependencyClassifier",
         "High",
@@ -77,7 +102,7 @@ RULES: list[Rule] = [
         "RDependencyRestoreFailure",
         "Build",
         "BuildFailure",
-        re.compile(r"(unresolved R deps after restore|dependency '.*' is not available)", re.IGNORECASE),
+        r"unresolved R deps after restore|dependency '.*' is not available",
         "Structural Ecosystem Mismatch",
         "DependencyClassifier",
         "Medium",
@@ -87,7 +112,7 @@ RULES: list[Rule] = [
         "PythonImportOrABIError",
         "Build",
         "BuildFailure",
-        re.compile(r"(No module named |ImportError:|DistributionNotFound)", re.IGNORECASE),
+        r"No module named |ImportError:|DistributionNotFound",
         "Structural Ecosystem Mismatch",
         "DependencyClassifier",
         "Medium",
@@ -97,7 +122,7 @@ RULES: list[Rule] = [
         "MissingHeaderOrIncludePath",
         "Build",
         "BuildFailure",
-        re.compile(r"fatal error: .*No such file or directory", re.IGNORECASE),
+        r"fatal error: .*No such file or directory",
         "Dependency Translation Defect",
         "DependencyClassifier",
         "High",
@@ -107,7 +132,7 @@ RULES: list[Rule] = [
         "MissingLinkTimeDependency",
         "Build",
         "BuildFailure",
-        re.compile(r"(undefined reference to|cannot find -l|no usable version found)", re.IGNORECASE),
+        r"undefined reference to|cannot find -l|no usable version found",
         "Dependency Translation Defect",
         "DependencyClassifier",
         "High",
@@ -117,7 +142,7 @@ RULES: list[Rule] = [
         "CMakeConfigurationFailure",
         "Build",
         "BuildFailure",
-        re.compile(r"CMake Error", re.IGNORECASE),
+        r"CMake Error",
         "Toolchain Drift",
         "SourceNormalizer",
         "Medium",
@@ -127,7 +152,7 @@ RULES: list[Rule] = [
         "AutotoolsConfigureFailure",
         "Build",
         "BuildFailure",
-        re.compile(r"configure: error:", re.IGNORECASE),
+        r"configure: error:",
         "Toolchain Drift",
         "SourceNormalizer",
         "Medium",
@@ -137,7 +162,7 @@ RULES: list[Rule] = [
         "PatchApplicationFailure",
         "SourceNormalization",
         "SpecSynthesisFailure",
-        re.compile(r"(can't find file to patch|No file to patch|Hunk .*FAILED)", re.IGNORECASE),
+        r"can't find file to patch|No file to patch|Hunk .*FAILED",
         "Upstream Build Defect",
         "SourceNormalizer",
         "Low",
@@ -147,7 +172,7 @@ RULES: list[Rule] = [
         "SourceFetchFailure",
         "SourceNormalization",
         "InfrastructureGateFailure",
-        re.compile(r"(source download failed after retries|Downloaded: .* failed)", re.IGNORECASE),
+        r"source download failed after retries|Downloaded: .* failed",
         "Adapter Infrastructure Issue",
         "SourceNormalizer",
         "Medium",
@@ -157,10 +182,7 @@ RULES: list[Rule] = [
         "BuildScriptContractFailure",
         "Build",
         "BuildFailure",
-        re.compile(
-            r"(empty string invalid as file name|No rule to make target|No targets specified and no makefile found|C compiler cannot create executables)",
-            re.IGNORECASE,
-        ),
+        r"empty string invalid as file name|No rule to make target|No targets specified and no makefile found|C compiler cannot create executables",
         "Upstream Build Defect",
         "SourceNormalizer",
         "Low",
@@ -170,7 +192,7 @@ RULES: list[Rule] = [
         "ToolchainResourceExhaustion",
         "Build",
         "BuildFailure",
-        re.compile(r"(exit status: 137|signal: 9|Killed)", re.IGNORECASE),
+        r"exit status: 137|signal: 9|Killed",
         "Toolchain Drift",
         "GovernanceException",
         "Low",
@@ -180,7 +202,7 @@ RULES: list[Rule] = [
         "RpmInstallScriptFailure",
         "Build",
         "BuildFailure",
-        re.compile(r"Bad exit status from .* \(%install\)", re.IGNORECASE),
+        r"Bad exit status from .* \(%install\)",
         "Upstream Build Defect",
         "SpecGenerator",
         "Low",
@@ -188,6 +210,73 @@ RULES: list[Rule] = [
     ),
 ]
 
+# One alternation over every rule, so non-matching text costs a single scan.
+_COMBINED_SOURCE = "|".join(f"(?P<{rule.canonical}>{rule.raw})" for rule in RULES)
+_COMBINED = _STDLIB_COMBINED = re.compile(_COMBINED_SOURCE, RULE_FLAGS)
+if re2 is not None:
+    # RE2 runs the same leftmost-first alternation as a linear-time automaton
+    # (the rules use no backreferences or lookaround). Its case folding only
+    # agrees with the stdlib's on ASCII, so other text keeps the stdlib engine.
+    try:
+        _COMBINED = re2.compile("(?i)" + _COMBINED_SOURCE)
+    except Exception:  # pragma: no cover - keep the stdlib engine
+        pass
+_RULE_INDEX = {rule.canonical: i for i, rule in enumerate(RULES)}
+_RULE_BY_CANONICAL = {rule.canonical: rule for rule in RULES}
+
+
+def _literal_prefixes(pattern: str) -> list[str]:
+    """Return the literal prefix of each top-level alternative in ``pattern``."""
+    prefixes: list[str] = []
+    current: list[str] = []
+    literal = True
+    depth = 0
+    in_class = False
+    escaped = False
+    for ch in pattern:
+        if escaped:
+            escaped = False
+            continue
+        if ch == "\\":
+            escaped = True
+            literal = False
+        elif in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+            literal = False
+        elif ch == "(":
+            depth += 1
+            literal = False
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            prefixes.append("".join(current).lower())
+            current = []
+            literal = True
+            continue
+        elif literal and not ch.isascii():
+            # IGNORECASE may match a non-ASCII pattern character to ASCII text.
+            literal = False
+        elif literal and ch in ".^$*+?{":
+            # A quantifier makes the preceding character optional.
+            if ch in "*+?{" and current:
+                current.pop()
+            literal = False
+        if literal:
+            current.append(ch)
+    prefixes.append("".join(current).lower())
+    return prefixes
+
+
+# Literal fast path: an ASCII line can only match a rule if its lowercased
+# text contains one of these prefixes, so most lines skip the regex engine
+# entirely. An alternative without a literal prefix contributes "", which
+# keeps every line on the regex path.
+_LITERAL_PREFIXES = tuple(
+    dict.fromkeys(p for rule in RULES for p in _literal_prefixes(rule.raw))
+)
+
 
 def file_ts(path: Path) -> str:
     dt = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
@@ -195,38 +284,37 @@ def file_ts(path: Path) -> str:
 
 
 def classify_text(text: str) -> Rule | None:
-    for rule in RULES:
+    """Return the highest-priority rule matching ``text``."""
+    # Only ASCII text is prefiltered: there IGNORECASE and str.lower() agree,
+    # whereas e.g. "İ" matches "i" under IGNORECASE but lowers to "i̇".
+    if text.isascii():
+        lowered = text.lower()
+        if not any(prefix in lowered for prefix in _LITERAL_PREFIXES):
+            return None
+        m = _COMBINED.search(text)
+    else:
+        m = _STDLIB_COMBINED.search(text)
+    if m is None:
+        return None
+    # The combined scan reports the leftmost hit; only rules ranked above it
+    # need re-checking to preserve priority order.
+    idx = _RULE_INDEX[m.lastgroup]
+    for rule in RULES[:idx]:
         if rule.pattern.search(text):
             return rule
-    return None
+    return RULES[idx]
 
 
-def first_signal(lines: list[str]) -> tuple[str, int]:
-    """Return first meaningful signal + index."""
-    for i, line in enumerate(lines):
-        s = line.strip()
-        if not s:
-            continue
-        if "error-format=json" in s:
-            continue
-        rule = classify_text(s)
-        if rule is not None:
-            return s, i
-    # fallback: first explicit error line
-    for i, line in enumerate(lines):
-        s = line.strip()
-        if re.search(r"\berror:\b", s, re.IGNORECASE):
-            return s, i
-    return "", -1
-
-
-def excerpt(lines: list[str], idx: int, width: int = 2) -> str:
-    if idx < 0:
+def category_rule(category: str) -> Rule | None:
+    # FirstFailureCategory usually carries a canonical class name; resolve that
+    # directly and only fall back to the rule patterns for free text.
+    return _RULE_BY_CANONICAL.get(category.strip()) or classify_text(category)
+
+
+def _field(row: list[str], idx: int | None) -> str:
+    if idx is None or idx >= len(row):
         return ""
-    lo = max(0, idx - width)
-    hi = min(len(lines), idx + width + 1)
-    part = [ln.strip() for ln in lines[lo:hi] if ln.strip()]
-    return " | ".join(part)
+    return row[idx]
 
 
 def package_from_log(path: Path) -> str:
@@ -236,37 +324,53 @@ def package_from_log(path: Path) -> str:
     return n
 
 
-def read_failure_gathering_tsv(tsv: Path) -> list[dict]:
-    rows: list[dict] = []
+def read_failure_gathering_tsv(tsv: Path) -> list[Record]:
+    rows: list[Record] = []
+    artifact_path = str(tsv)
+    timestamp = file_ts(tsv)
     with tsv.open("r", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh, delimiter="\t")
+        reader = csv.reader(fh, delimiter="\t")
+        header = next(reader, None)
+        if header is None:
+            return rows
+        # Resolve columns once; the last duplicate header wins, as with DictReader.
+        index = {name: i for i, name in enumerate(header)}
+        i_package = index.get("Package")
+        i_signal = index.get("FailureSignal")
+        i_category = index.get("FirstFailureCategory")
+        i_context = index.get("ModuleContext")
+        if i_signal is None:
+            # Rows without a FailureSignal are skipped, so nothing to ingest.
+            return rows
         for row in reader:
-            signal = (row.get("FailureSignal") or "").strip()
+            if not row:
+                continue
+            signal = _field(row, i_signal).strip()
             if not signal:
                 continue
-            rule = classify_text(signal) or classify_text(row.get("FirstFailureCategory", ""))
+            rule = classify_text(signal) or category_rule(_field(row, i_category))
             rows.append(
-                {
-                    "source_type": "adapter_failure_tsv",
-                    "artifact_path": str(tsv),
-                    "timestamp": file_ts(tsv),
-                    "package": (row.get("Package") or "").strip(),
-                    "stage": rule.stage if rule else "Ingestion",
-                    "stage_failure": rule.stage_failure if rule else "InfrastructureGateFailure",
-                    "canonical_class": rule.canonical if rule else "Unknown",
-                    "raw_signal": signal,
-                    "log_excerpt": signal,
-                    "execution_mode": (
+                Record(
+                    source_type="adapter_failure_tsv",
+                    artifact_path=artifact_path,
+                    timestamp=timestamp,
+                    package=_field(row, i_package).strip(),
+                    stage=rule.stage if rule else "Ingestion",
+                    stage_failure=rule.stage_failure if rule else "InfrastructureGateFailure",
+                    canonical_class=rule.canonical if rule else "Unknown",
+                    raw_signal=signal,
+                    log_excerpt=signal,
+                    execution_mode=(
                         "Production"
-                        if "deployment=Production" in (row.get("ModuleContext") or "")
+                        if "deployment=Production" in _field(row, i_context)
                         else "Unknown"
                     ),
-                }
+                )
             )
     return rows
 
 
-def read_bad_spec(path: Path) -> dict | None:
+def read_bad_spec(path: Path) -> Record | None:
     text = path.read_text(encoding="utf-8", errors="replace")
     reason = ""
     for line in text.splitlines():
@@ -279,133 +383,282 @@ def read_bad_spec(path: Path) -> dict | None:
     if " tail=" in reason:
         signal = reason.split(" tail=", 1)[1].strip()
     rule = classify_text(signal) or classify_text(reason)
-    return {
-        "source_type": "bad_spec",
-        "artifact_path": str(path),
-        "timestamp": file_ts(path),
-        "package": path.stem,
-        "stage": rule.stage if rule else "Build",
-        "stage_failure": rule.stage_failure if rule else "BuildFailure",
-        "canonical_class": rule.canonical if rule else "Unknown",
-        "raw_signal": signal,
-        "log_excerpt": reason[:1200],
-        "execution_mode": "Unknown",
-    }
-
-
-def log_failed(lines: Iterable[str]) -> bool:
-    rx = re.compile(
-        r"(DEPGRAPH\|[^|]+\|unresolved\||Failed build dependencies:|No match for argument:|fatal error:|configure: error:|CMake Error|No module named |ImportError:|Bad exit status from|undefined reference to|cannot find -l|can't find file to patch|No file to patch|source download failed after retries|blocked by failed dependencies|signal: 9|exit status: 137)",
-        re.IGNORECASE,
+    return Record(
+        source_type="bad_spec",
+        artifact_path=str(path),
+        timestamp=file_ts(path),
+        package=path.stem,
+        stage=rule.stage if rule else "Build",
+        stage_failure=rule.stage_failure if rule else "BuildFailure",
+        canonical_class=rule.canonical if rule else "Unknown",
+        raw_signal=signal,
+        log_excerpt=reason[:1200],
+        execution_mode="Unknown",
     )
-    return any(rx.search(ln) for ln in lines)
 
 
-def read_build_log(path: Path) -> dict | None:
-    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
-    if not log_failed(lines):
+# Markers that flag a build log as failed at all (classification is left to
+# RULES). They are matched against the raw, ASCII-lowercased log bytes; all
+# but the DEPGRAPH marker are plain literals, so bytes.find suffices.
+_FAILURE_LITERALS: tuple[bytes, ...] = (
+    b"failed build dependencies:",
+    b"no match for argument:",
+    b"fatal error:",
+    b"configure: error:",
+    b"cmake error",
+    b"no module named ",
+    b"importerror:",
+    b"bad exit status from",
+    b"undefined reference to",
+    b"cannot find -l",
+    b"can't find file to patch",
+    b"no file to patch",
+    b"source download failed after retries",
+    b"blocked by failed dependencies",
+    b"signal: 9",
+    b"exit status: 137",
+)
+# DEPGRAPH candidates are found by their literal prefix and confirmed on the
+# rest of their line, split the way str.splitlines() splits it.
+_DEPGRAPH_PREFIX = b"depgraph|"
+_FAILURE_DEPGRAPH = re.compile(r"depgraph\|[^|]+\|unresolved\|", re.IGNORECASE)
+# The gate lowers the mapped log one block at a time; consecutive blocks
+# overlap so a marker straddling a boundary is still seen whole.
+_GATE_BLOCK = 1 << 20
+_GATE_OVERLAP = max(len(m) for m in (*_FAILURE_LITERALS, _DEPGRAPH_PREFIX)) - 1
+# IGNORECASE also matches "İ", "ı", "ſ" and the Kelvin sign to ASCII letters,
+# which ASCII lowering cannot see; a log containing any of them is checked
+# line by line with the full marker pattern instead.
+_NON_ASCII_FOLDS = tuple(ch.encode() for ch in "\u0130\u0131\u017f\u212a")
+_FAILURE_MARKERS = re.compile(
+    "|".join(
+        (_FAILURE_DEPGRAPH.pattern, *(re.escape(m.decode()) for m in _FAILURE_LITERALS))
+    ),
+    re.IGNORECASE,
+)
+_GENERIC_ERROR = re.compile(r"\berror:\b", re.IGNORECASE)
+
+
+def _depgraph_at(mm: mmap.mmap, pos: int) -> bool:
+    end = mm.find(b"\n", pos)
+    tail = mm[pos : end if end >= 0 else len(mm)].decode("utf-8", errors="replace")
+    lines = tail.splitlines()
+    return bool(lines) and _FAILURE_DEPGRAPH.match(lines[0]) is not None
+
+
+def _has_failure_marker(mm: mmap.mmap) -> bool:
+    size = len(mm)
+    start = 0
+    while start < size:
+        lo = max(0, start - _GATE_OVERLAP)
+        end = min(start + _GATE_BLOCK, size)
+        block = mm[lo:end].lower()
+        if any(block.find(marker) >= 0 for marker in _FAILURE_LITERALS):
+            return True
+        pos = block.find(_DEPGRAPH_PREFIX)
+        while pos >= 0:
+            if _depgraph_at(mm, lo + pos):
+                return True
+            pos = block.find(_DEPGRAPH_PREFIX, pos + 1)
+        if any(block.find(ch) >= 0 for ch in _NON_ASCII_FOLDS):
+            text = mm[:].decode("utf-8", errors="replace")
+            return any(_FAILURE_MARKERS.search(line) for line in text.splitlines())
+        start = end
+    return False
+
+
+def log_failed(path: Path) -> tuple[bool, bool]:
+    """Return (has failure marker, has patch activity) for the log at ``path``."""
+    with path.open("rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return False, False
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            failed = _has_failure_marker(mm)
+            return failed, failed and mm.find(b"patching file") >= 0
+
+
+def _split_lines(fh: Iterable[str]) -> Iterator[str]:
+    # File iteration only breaks on \n and \r; str.splitlines() also breaks on
+    # \f, \v, \x1c-\x1e, \x85, U+2028 and U+2029, so split again to match it.
+    for line in fh:
+        yield from line.splitlines()
+
+
+def read_build_log(path: Path, width: int = 2) -> Record | None:
+    # Most logs carry no failure marker; settle that on the raw bytes before
+    # paying for decoding and line classification.
+    failed, patch_activity = log_failed(path)
+    if not failed:
         return None
-    signal, idx = first_signal(lines)
+    # Single streaming pass for the first rule signal, the first explicit
+    # `error:` line (fallback signal) and their excerpt windows. Only the
+    # windows are retained, and reading stops once the rule signal's
+    # trailing context is collected.
+    signal = ""
+    rule: Rule | None = None
+    part: list[str] = []
+    trailing = 0
+    fallback = ""
+    fallback_part: list[str] = []
+    fallback_trailing = 0
+    window: deque[str] = deque(maxlen=width + 1)
+    with path.open("r", encoding="utf-8", errors="replace") as fh:
+        for line in _split_lines(fh):
+            s = line.strip()
+            if signal:
+                if not trailing:
+                    break
+                trailing -= 1
+                if s:
+                    part.append(s)
+                continue
+            if fallback_trailing:
+                fallback_trailing -= 1
+                if s:
+                    fallback_part.append(s)
+            window.append(s)
+            if s and "error-format=json" not in s:
+                rule = classify_text(s)
+                if rule is not None:
+                    signal = s
+                    part = [ln for ln in window if ln]
+                    trailing = width
+                    continue
+            if not fallback and _GENERIC_ERROR.search(s):
+                fallback = s
+                fallback_part = [ln for ln in window if ln]
+                fallback_trailing = width
     if not signal:
-        return None
-    rule = classify_text(signal)
-    return {
-        "source_type": "build_log",
-        "artifact_path": str(path),
-        "timestamp": file_ts(path),
-        "package": package_from_log(path),
-        "stage": rule.stage if rule else "Build",
-        "stage_failure": rule.stage_failure if rule else "BuildFailure",
-        "canonical_class": rule.canonical if rule else "Unknown",
-        "raw_signal": signal,
-        "log_excerpt": excerpt(lines, idx),
-        "execution_mode": "Unknown",
-        "has_patch_activity": any("patching file" in ln for ln in lines),
-    }
+        if not fallback:
+            return None
+        signal, part = fallback, fallback_part
+        rule = classify_text(signal)
+    return Record(
+        source_type="build_log",
+        artifact_path=str(path),
+        timestamp=file_ts(path),
+        package=package_from_log(path),
+        stage=rule.stage if rule else "Build",
+        stage_failure=rule.stage_failure if rule else "BuildFailure",
+        canonical_class=rule.canonical if rule else "Unknown",
+        raw_signal=signal,
+        log_excerpt=" | ".join(part),
+        execution_mode="Unknown",
+        has_patch_activity=patch_activity,
+    )
 
 
 def structural_label(canonical_class: str) -> str:
-    for r in RULES:
-        if r.canonical == canonical_class:
-            return r.structural_label
-    return "Adapter Infrastructure Issue"
+    r = _RULE_BY_CANONICAL.get(canonical_class)
+    return r.structural_label if r else "Adapter Infrastructure Issue"
 
 
 def candidate_meta(canonical_class: str) -> tuple[str, str, bool]:
-    for r in RULES:
-        if r.canonical == canonical_class:
-            return r.normalization_layer, r.automation_feasibility, r.deterministic_opportunity
-    return ("GovernanceException", "Low", False)
+    r = _RULE_BY_CANONICAL.get(canonical_class)
+    if r is None:
+        return ("GovernanceException", "Low", False)
+    return r.normalization_layer, r.automation_feasibility, r.deterministic_opportunity
 
 
 def pct(num: int, den: int) -> float:
     return (100.0 * num / den) if den else 0.0
 
 
-def write_tsv(path: Path, rows: list[dict], fields: list[str]) -> None:
-    with path.open("w", encoding="utf-8", newline="") as fh:
-        writer = csv.DictWriter(fh, fieldnames=fields, delimiter="\t")
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({k: row.get(k, "") for k in fields})
+def write_tsv(path: Path, rows: Iterable[Sequence[object]], fields: list[str]) -> None:
+    # A 1 MiB buffer keeps large record tables to a handful of write(2) calls.
+    with path.open("w", encoding="utf-8", newline="", buffering=1 << 20) as fh:
+        writer = csv.writer(fh, delimiter="\t")
+        writer.writerow(fields)
+        writer.writerows(rows)
 
 
-def run(target_root: Path, out_dir: Path) -> None:
+def list_build_logs(build_logs_dir: Path) -> list[Path]:
+    # Deterministic build-log selection:
+    # use non-attempt final logs only; keep both payload and -default variants as separate contexts.
+    # Filtering on scandir entry names avoids building Path objects for attempt logs.
+    try:
+        with os.scandir(build_logs_dir) as it:
+            logs = [
+                Path(entry.path)
+                for entry in it
+                if entry.name.endswith(".log") and ".attempt" not in entry.name and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    logs.sort()
+    return logs
+
+
+def run(target_root: Path, out_dir: Path, jobs: int | None = None) -> None:
     bad_spec_dir = target_root / "BAD_SPEC"
     build_logs_dir = target_root / "reports" / "build_logs"
     failure_gathering_dir = target_root / "reports" / "failure_gathering"
 
-    records: list[dict] = []
+    records: list[Record] = []
     patch_activity_logs = 0
+    patch_drift: list[dict] = []
 
     bad_spec_files = sorted(bad_spec_dir.glob("*.txt"))
-    for p in bad_spec_files:
-        rec = read_bad_spec(p)
-        if rec:
-            records.append(rec)
-
-    # Deterministic build-log selection:
-    # use non-attempt final logs only; keep both payload and -default variants as separate contexts.
-    build_logs = sorted(
-        p
-        for p in build_logs_dir.glob("*.log")
-        if ".attempt" not in p.name
-    )
-    for p in build_logs:
-        rec = read_build_log(p)
-        if rec:
-            records.append(rec)
-            if rec.get("has_patch_activity"):
-                patch_activity_logs += 1
-
+    build_logs = list_build_logs(build_logs_dir)
     failure_tsvs = sorted(failure_gathering_dir.glob("*_per_package.tsv"))
-    for tsv in failure_tsvs:
-        records.extend(read_failure_gathering_tsv(tsv))
 
-    total = len(records)
-    category_counts = Counter(r["canonical_class"] for r in records)
-    stage_counts = Counter(r["stage"] for r in records)
-    source_counts = Counter(r["source_type"] for r in records)
+    # Artifacts are independent, so parse them across worker processes;
+    # Executor.map yields results in input order, keeping output deterministic.
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        bad_spec_results = pool.map(read_bad_spec, bad_spec_files, chunksize=32)
+        build_log_results = pool.map(read_build_log, build_logs, chunksize=32)
+        tsv_results = pool.map(read_failure_gathering_tsv, failure_tsvs)
+
+        for rec in bad_spec_results:
+            if rec:
+                records.append(rec)
+        for rec in build_log_results:
+            if rec:
+                records.append(rec)
+                if rec.has_patch_activity:
+                    patch_activity_logs += 1
+                    # Heuristic drift signal: patches applied, yet the build failed elsewhere.
+                    if rec.canonical_class != "PatchApplicationFailure":
+                        patch_drift.append(
+                            {
+                                "package": rec.package,
+                                "canonical_class": rec.canonical_class,
+                                "artifact_path": rec.artifact_path,
+                            }
+                        )
+        for rows in tsv_results:
+            records.extend(rows)
 
-    clusters = []
-    by_cat: dict[str, list[dict]] = defaultdict(list)
+    total = len(records)
+    category_counts: Counter[str] = Counter()
+    stage_counts: Counter[str] = Counter()
+    source_counts: Counter[str] = Counter()
+    # (package, canonical_class) pairs feed the heuristic drift signals below.
+    repeated: Counter[tuple[str, str]] = Counter()
+    # First three distinct raw signals per class, in record order.
+    cluster_examples: dict[str, list[str]] = {}
+    cluster_seen: dict[str, set[str]] = {}
     for r in records:
-        by_cat[r["canonical_class"]].append(r)
-    for cat, cat_rows in sorted(by_cat.items(), key=lambda kv: (-len(kv[1]), kv[0])):
-        examples = []
-        seen = set()
-        for row in cat_rows:
-            sig = row["raw_signal"]
+        cat = r.canonical_class
+        category_counts[cat] += 1
+        stage_counts[r.stage] += 1
+        source_counts[r.source_type] += 1
+        repeated[(r.package, cat)] += 1
+        examples = cluster_examples.setdefault(cat, [])
+        if len(examples) < 3:
+            sig = r.raw_signal
+            seen = cluster_seen.setdefault(cat, set())
             if sig not in seen:
                 seen.add(sig)
                 examples.append(sig[:240])
-            if len(examples) >= 3:
-                break
+
+    clusters = []
+    for cat, cnt in sorted(category_counts.items(), key=lambda kv: (-kv[1], kv[0])):
         clusters.append(
             {
                 "canonical_class": cat,
-                "occurrences": len(cat_rows),
-                "representative_examples": examples,
+                "occurrences": cnt,
+                "representative_examples": cluster_examples[cat],
                 "structural_label": structural_label(cat),
             }
         )
@@ -433,7 +686,6 @@ def run(target_root: Path, out_dir: Path) -> None:
     taxonomy_insufficient = unknown_pct > 20.0
 
     # Heuristic drift signals
-    repeated = Counter((r["package"], r["canonical_class"]) for r in records)
     repeated_signatures = [
         {"package": pkg, "canonical_class": cat, "occurrences": n}
         for (pkg, cat), n in repeated.items()
@@ -441,18 +693,6 @@ def run(target_root: Path, out_dir: Path) -> None:
     ]
     repeated_signatures.sort(key=lambda x: (-x["occurrences"], x["package"], x["canonical_class"]))
 
-    patch_drift = []
-    for r in records:
-        if r.get("source_type") == "build_log" and r.get("has_patch_activity"):
-            if r["canonical_class"] not in {"PatchApplicationFailure"}:
-                patch_drift.append(
-                    {
-                        "package": r["package"],
-                        "canonical_class": r["canonical_class"],
-                        "artifact_path": r["artifact_path"],
-                    }
-                )
-
     long_tail_share = pct(sum(v for _, v in long_tail), total)
     rule_proliferation_indicator = long_tail_share > 40.0
 
@@ -463,42 +703,37 @@ def run(target_root: Path, out_dir: Path) -> None:
     summary_json = out_dir / "historical_log_mining_summary.json"
     report_md = out_dir / "historical_log_mining_report.md"
 
-    write_tsv(
-        records_tsv,
-        records,
-        [
-            "package",
-            "stage",
-            "stage_failure",
-            "canonical_class",
-            "source_type",
-            "timestamp",
-            "execution_mode",
-            "raw_signal",
-            "log_excerpt",
-            "artifact_path",
-        ],
-    )
-    write_tsv(
-        clusters_tsv,
-        clusters,
-        [
-            "canonical_class",
-            "occurrences",
-            "structural_label",
-            "representative_examples",
-        ],
-    )
+    record_fields = [
+        "package",
+        "stage",
+        "stage_failure",
+        "canonical_class",
+        "source_type",
+        "timestamp",
+        "execution_mode",
+        "raw_signal",
+        "log_excerpt",
+        "artifact_path",
+    ]
+    write_tsv(records_tsv, map(attrgetter(*record_fields), records), record_fields)
+    cluster_fields = [
+        "canonical_class",
+        "occurrences",
+        "structural_label",
+        "representative_examples",
+    ]
+    write_tsv(clusters_tsv, map(itemgetter(*cluster_fields), clusters), cluster_fields)
+    candidate_fields = [
+        "failure_category",
+        "proposed_layer",
+        "automation_feasibility",
+        "deterministic_normalization_opportunity",
+        "estimated_impact_percent",
+    ]
     write_tsv(
         candidates_tsv,
-        normalization_candidates,
-        [
-            "failure_category",
-            "proposed_layer",
-            "automation_feasibility",
-            "deterministic_normalization_opportunity",
-            "estimated_impact_percent",
-        ],
+        map(itemgetter(*candidate_fields), normalization_candidates),
+        candidate_fields,
     )
 
     payload = {
@@ -535,129 +770,137 @@ def run(target_root: Path, out_dir: Path) -> None:
     summary_json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
     # markdown report
-    lines = []
-    lines.append("# Historical Log Mining Report")
-    lines.append("")
-    lines.append("## 1. HistoricalFailureSummary")
-    lines.append(f"- Target root: `{target_root}`")
-    lines.append(f"- Total historical failure records: **{total}**")
-    lines.append(f"- BAD_SPEC artifacts: **{len(bad_spec_files)}**")
-    lines.append(f"- Build logs examined (non-attempt): **{len(build_logs)}**")
-    lines.append(f"- Failure-gathering TSV inputs: **{len(failure_tsvs)}**")
-    lines.append(f"- Patch-injection artifacts observed in failing logs: **{patch_activity_logs}**")
-    lines.append("")
-    lines.append("### HistoricalFailureRecord schema")
-    lines.append("`{ package, stage, raw_signal, log_excerpt }`")
-    lines.append("")
-    lines.append("## 2. Failure Signal Extraction Rules (Deterministic)")
-    lines.append("")
-    lines.append("Regex-style ordered extraction patterns:")
-    lines.append("")
-    lines.append("| Priority | Pattern (abridged) | CanonicalClass |")
-    lines.append("|---:|---|---|")
+    buf = io.StringIO()
+    w = buf.write
+    w("# Historical Log Mining Report\n")
+    w("\n")
+    w("## 1. HistoricalFailureSummary\n")
+    w(f"- Target root: `{target_root}`\n")
+    w(f"- Total historical failure records: **{total}**\n")
+    w(f"- BAD_SPEC artifacts: **{len(bad_spec_files)}**\n")
+    w(f"- Build logs examined (non-attempt): **{len(build_logs)}**\n")
+    w(f"- Failure-gathering TSV inputs: **{len(failure_tsvs)}**\n")
+    w(f"- Patch-injection artifacts observed in failing logs: **{patch_activity_logs}**\n")
+    w("\n")
+    w("### HistoricalFailureRecord schema\n")
+    w("`{ package, stage, raw_signal, log_excerpt }`\n")
+    w("\n")
+    w("## 2. Failure Signal Extraction Rules (Deterministic)\n")
+    w("\n")
+    w("Regex-style ordered extraction patterns:\n")
+    w("\n")
+    w("| Priority | Pattern (abridged) | CanonicalClass |\n")
+    w("|---:|---|---|\n")
     for i, rule in enumerate(RULES, start=1):
-        patt = rule.pattern.pattern.replace("|", "\\|")
+        patt = rule.raw.replace("|", "\\|")
         if len(patt) > 100:
             patt = patt[:97] + "..."
-        lines.append(f"| {i} | `{patt}` | {rule.canonical} |")
-    lines.append("")
-    lines.append("Noise suppression rules:")
-    lines.append("- Ignore empty lines.")
-    lines.append("- Ignore rust `error-format=json` command lines.")
-    lines.append("- If no deterministic pattern matches, fallback to first explicit `error:` line.")
-    lines.append("")
-    lines.append("## 3. Canonicalization")
-    lines.append("")
-    lines.append("| CanonicalClass | Occurrences | RepresentativeExamples |")
-    lines.append("|---|---:|---|")
+        w(f"| {i} | `{patt}` | {rule.canonical} |\n")
+    w("\n")
+    w("Noise suppression rules:\n")
+    w("- Ignore empty lines.\n")
+    w("- Ignore rust `error-format=json` command lines.\n")
+    w("- If no deterministic pattern matches, fallback to first explicit `error:` line.\n")
+    w("\n")
+    w("## 3. Canonicalization\n")
+    w("\n")
+    w("| CanonicalClass | Occurrences | RepresentativeExamples |\n")
+    w("|---|---:|---|\n")
     for cluster in clusters[:10]:
         ex = " <br> ".join(cluster["representative_examples"]).replace("|", "\\|")
-        lines.append(f"| {cluster['canonical_class']} | {cluster['occurrences']} | {ex} |")
-    lines.append("")
-    lines.append("## 4. CanonicalFailureDistribution")
-    lines.append("")
-    lines.append("| FailureCategory | Count | % of Historical Failures |")
-    lines.append("|---|---:|---:|")
+        w(f"| {cluster['canonical_class']} | {cluster['occurrences']} | {ex} |\n")
+    w("\n")
+    w("## 4. CanonicalFailureDistribution\n")
+    w("\n")
+    w("| FailureCategory | Count | % of Historical Failures |\n")
+    w("|---|---:|---:|\n")
     for cat, cnt in sorted(category_counts.items(), key=lambda kv: (-kv[1], kv[0])):
-        lines.append(f"| {cat} | {cnt} | {pct(cnt, total):.2f}% |")
-    lines.append("")
-    lines.append("## 5. Frequency & Stage Distribution")
-    lines.append("")
-    lines.append("| PipelineStage | Count | % |")
-    lines.append("|---|---:|---:|")
+        w(f"| {cat} | {cnt} | {pct(cnt, total):.2f}% |\n")
+    w("\n")
+    w("## 5. Frequency & Stage Distribution\n")
+    w("\n")
+    w("| PipelineStage | Count | % |\n")
+    w("|---|---:|---:|\n")
     for stg, cnt in sorted(stage_counts.items(), key=lambda kv: (-kv[1], kv[0])):
-        lines.append(f"| {stg} | {cnt} | {pct(cnt, total):.2f}% |")
-    lines.append("")
-    lines.append("### Top 10 recurring canonical classes")
-    lines.append("")
-    lines.append("| Rank | FailureCategory | Count | % |")
-    lines.append("|---:|---|---:|---:|")
+        w(f"| {stg} | {cnt} | {pct(cnt, total):.2f}% |\n")
+    w("\n")
+    w("### Top 10 recurring canonical classes\n")
+    w("\n")
+    w("| Rank | FailureCategory | Count | % |\n")
+    w("|---:|---|---:|---:|\n")
     for i, (cat, cnt) in enumerate(top10, start=1):
-        lines.append(f"| {i} | {cat} | {cnt} | {pct(cnt, total):.2f}% |")
-    lines.append("")
-    lines.append("### Long-tail classes (<3% frequency)")
-    lines.append("")
-    lines.append("| FailureCategory | Count | % |")
-    lines.append("|---|---:|---:|")
+        w(f"| {i} | {cat} | {cnt} | {pct(cnt, total):.2f}% |\n")
+    w("\n")
+    w("### Long-tail classes (<3% frequency)\n")
+    w("\n")
+    w("| FailureCategory | Count | % |\n")
+    w("|---|---:|---:|\n")
     for cat, cnt in sorted(long_tail, key=lambda kv: (-kv[1], kv[0])):
-        lines.append(f"| {cat} | {cnt} | {pct(cnt, total):.2f}% |")
-    lines.append("")
-    lines.append("## 6. StructuralVsIncidentalBreakdown")
-    lines.append("")
-    lines.append("| FailureCategory | Structural Label | Count |")
-    lines.append("|---|---|---:|")
+        w(f"| {cat} | {cnt} | {pct(cnt, total):.2f}% |\n")
+    w("\n")
+    w("## 6. StructuralVsIncidentalBreakdown\n")
+    w("\n")
+    w("| FailureCategory | Structural Label | Count |\n")
+    w("|---|---|---:|\n")
     for cat, cnt in sorted(category_counts.items(), key=lambda kv: (-kv[1], kv[0])):
-        lines.append(f"| {cat} | {structural_label(cat)} | {cnt} |")
-    lines.append("")
-    lines.append("## 7. NormalizationCandidateMatrix")
-    lines.append("")
-    lines.append("| FailureCategory | Deterministic Normalization Opportunity | Proposed Layer | Automation Feasibility | Estimated Impact % |")
-    lines.append("|---|---|---|---|---:|")
+        w(f"| {cat} | {structural_label(cat)} | {cnt} |\n")
+    w("\n")
+    w("## 7. NormalizationCandidateMatrix\n")
+    w("\n")
+    w("| FailureCategory | Deterministic Normalization Opportunity | Proposed Layer | Automation Feasibility | Estimated Impact % |\n")
+    w("|---|---|---|---|---:|\n")
     for row in normalization_candidates:
-        lines.append(
-            "| {failure_category} | {deterministic_normalization_opportunity} | {proposed_layer} | {automation_feasibility} | {estimated_impact_percent:.2f}% |".format(
+        w(
+            "| {failure_category} | {deterministic_normalization_opportunity} | {proposed_layer} | {automation_feasibility} | {estimated_impact_percent:.2f}% |\n".format(
                 **row
             )
         )
-    lines.append("")
-    lines.append("## 8. ClassifierCoverageScore")
-    lines.append("")
-    lines.append(f"- Classified: **{classified}/{total} ({coverage:.2f}%)**")
-    lines.append(f"- Unknown: **{unknown}/{total} ({unknown_pct:.2f}%)**")
-    lines.append(f"- Taxonomy insufficiency flag (`Unknown > 20%`): **{str(taxonomy_insufficient).lower()}**")
-    lines.append("")
-    lines.append("## 9. HeuristicDriftFindings")
-    lines.append("")
-    lines.append("### Repeated manual-signature candidates (package + canonical class, occurrences >=2)")
-    lines.append("")
-    lines.append("| Package | FailureCategory | Occurrences |")
-    lines.append("|---|---|---:|")
+    w("\n")
+    w("## 8. ClassifierCoverageScore\n")
+    w("\n")
+    w(f"- Classified: **{classified}/{total} ({coverage:.2f}%)**\n")
+    w(f"- Unknown: **{unknown}/{total} ({unknown_pct:.2f}%)**\n")
+    w(f"- Taxonomy insufficiency flag (`Unknown > 20%`): **{str(taxonomy_insufficient).lower()}**\n")
+    w("\n")
+    w("## 9. HeuristicDriftFindings\n")
+    w("\n")
+    w("### Repeated manual-signature candidates (package + canonical class, occurrences >=2)\n")
+    w("\n")
+    w("| Package | FailureCategory | Occurrences |\n")
+    w("|---|---|---:|\n")
     for item in repeated_signatures[:25]:
-        lines.append(f"| {item['package']} | {item['canonical_class']} | {item['occurrences']} |")
-    lines.append("")
-    lines.append("### Patch activity not ending in PatchApplicationFailure")
-    lines.append("")
-    lines.append("| Package | FailureCategory | Artifact |")
-    lines.append("|---|---|---|")
+        w(f"| {item['package']} | {item['canonical_class']} | {item['occurrences']} |\n")
+    w("\n")
+    w("### Patch activity not ending in PatchApplicationFailure\n")
+    w("\n")
+    w("| Package | FailureCategory | Artifact |\n")
+    w("|---|---|---|\n")
     for item in patch_drift[:25]:
-        lines.append(f"| {item['package']} | {item['canonical_class']} | `{item['artifact_path']}` |")
-    lines.append("")
-    lines.append(f"- Long-tail share: **{long_tail_share:.2f}%**")
-    lines.append(f"- Rule proliferation indicator (long-tail share > 40%): **{str(rule_proliferation_indicator).lower()}**")
-    lines.append("")
-    lines.append("## 10. StrategicRecommendations for Live Sampling Readiness")
-    lines.append("")
-    lines.append("1. Keep metadata-adapter runtime preflight as a hard campaign gate to prevent ingestion-stage dataset contamination.")
-    lines.append("2. Prioritize deterministic normalization for `UnresolvedBuildRequiresToken`, `MissingHeaderOrIncludePath`, and `MissingLinkTimeDependency` before expanding live sampling breadth.")
-    lines.append("3. Treat `PatchApplicationFailure` and `BuildScriptContractFailure` as lower-automation classes requiring targeted SourceNormalizer policy, not package-local heuristics.")
-    lines.append("4. Use this mined distribution as a seed prior for stratified adaptive sampling weights; refresh after each normalization rule cycle.")
-    lines.append("")
-    lines.append("## 11. Artifact Paths")
-    lines.append(f"- Records: `{records_tsv}`")
-    lines.append(f"- Clusters: `{clusters_tsv}`")
-    lines.append(f"- Candidates: `{candidates_tsv}`")
-    lines.append(f"- Summary JSON: `{summary_json}`")
-    report_md.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        w(f"| {item['package']} | {item['canonical_class']} | `{item['artifact_path']}` |\n")
+    w("\n")
+    w(f"- Long-tail share: **{long_tail_share:.2f}%**\n")
+    w(f"- Rule proliferation indicator (long-tail share > 40%): **{str(rule_proliferation_indicator).lower()}**\n")
+    w("\n")
+    w("## 10. StrategicRecommendations for Live Sampling Readiness\n")
+    w("\n")
+    w("1. Keep metadata-adapter runtime preflight as a hard campaign gate to prevent ingestion-stage dataset contamination.\n")
+    w("2. Prioritize deterministic normalization for `UnresolvedBuildRequiresToken`, `MissingHeaderOrIncludePath`, and `MissingLinkTimeDependency` before expanding live sampling breadth.\n")
+    w("3. Treat `PatchApplicationFailure` and `BuildScriptContractFailure` as lower-automation classes requiring targeted SourceNormalizer policy, not package-local heuristics.\n")
+    w("4. Use this mined distribution as a seed prior for stratified adaptive sampling weights; refresh after each normalization rule cycle.\n")
+    w("\n")
+    w("## 11. Artifact Paths\n")
+    w(f"- Records: `{records_tsv}`\n")
+    w(f"- Clusters: `{clusters_tsv}`\n")
+    w(f"- Candidates: `{candidates_tsv}`\n")
+    w(f"- Summary JSON: `{summary_json}`\n")
+    report_md.write_text(buf.getvalue(), encoding="utf-8")
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
 
 
 def main() -> None:
@@ -674,8 +917,14 @@ def main() -> None:
         default=Path("docs/historical_log_mining"),
         help="Output directory for mined artifacts",
     )
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=None,
+        help="Worker processes for artifact parsing (default: CPU count)",
+    )
     args = parser.parse_args()
-    run(args.target_root, args.out_dir)
+    run(args.target_root, args.out_dir, args.jobs)
 
 
 if __name__ == "__main__":